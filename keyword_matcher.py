@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher for HorizonJam music detection
+Builds a multi-pattern matcher once and scans each phrase in a single pass
+Backends, fastest first: Hyperscan database, pyahocorasick automaton, compiled regex alternation
+"""
+
+import re
+from typing import Iterable, List, Optional
+
+# Hyperscan block-mode database (optional)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Aho-Corasick automaton (optional)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def _is_word_char(char: str) -> bool:
+    """True for characters re treats as part of a word"""
+    return char.isalnum() or char == "_"
+
+
+def _starts_word(text: str, start: int, keyword: str) -> bool:
+    """True unless keyword is glued onto the end of a preceding word ("key" inside "monkey")"""
+    return start == 0 or not _is_word_char(keyword[0]) or not _is_word_char(text[start - 1])
+
+
+def _collect_match(keyword_id, start, end, flags, hits):
+    """Hyperscan match callback - record the id of the keyword that fired"""
+    hits.append(keyword_id)
+
+
+class KeywordMatcher:
+    """
+    Case-insensitive matcher over a fixed keyword set
+    Keywords must start at a word boundary but may run on ("chord" matches "chords", not "harpsichord")
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """Compile the keyword set into a single database/automaton (or regex fallback)"""
+        self.keywords = frozenset(keyword.lower() for keyword in keywords if keyword)
+        self._database = None
+        self._automaton = None
+        self._regex = None
+
+        if not self.keywords:
+            return
+
+        if HYPERSCAN_AVAILABLE:
+            self._ordered = sorted(self.keywords)
+            self._database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            self._database.compile(
+                expressions=[self._boundary_pattern(keyword, r"(?:^|\W)").encode("utf-8") for keyword in self._ordered],
+                ids=list(range(len(self._ordered))),
+                elements=len(self._ordered),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP]
+                * len(self._ordered),
+            )
+        elif AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+        else:
+            # Longest keywords first so the alternation prefers the most specific match
+            ordered = sorted(self.keywords, key=len, reverse=True)
+            self._regex = re.compile("|".join(self._boundary_pattern(keyword, r"(?<!\w)") for keyword in ordered))
+
+    @staticmethod
+    def _boundary_pattern(keyword: str, boundary: str) -> str:
+        """Escape keyword and anchor it to the start of a word when it begins with a word character"""
+        escaped = re.escape(keyword)
+        return boundary + escaped if _is_word_char(keyword[0]) else escaped
+
+    def _scan_database(self, text_lower: str) -> List[str]:
+        """Run one Hyperscan pass and return the keywords that fired, in match order"""
+        hits = []
+        self._database.scan(text_lower.encode("utf-8"), match_event_handler=_collect_match, context=hits)
+        return [self._ordered[keyword_id] for keyword_id in hits]
+
+    def search(self, text: str, already_lower: bool = False) -> Optional[str]:
+        """Return the first keyword found in text, or None"""
+        if not self.keywords:
+            return None
+        text_lower = text if already_lower else text.lower()
+
+        if self._database is not None:
+            hits = self._scan_database(text_lower)
+            return hits[0] if hits else None
+
+        if self._automaton is not None:
+            for end, keyword in self._automaton.iter(text_lower):
+                if _starts_word(text_lower, end - len(keyword) + 1, keyword):
+                    return keyword
+            return None
+
+        match = self._regex.search(text_lower)
+        return match.group(0) if match else None
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Neural Text-to-Speech for HorizonJam
+On-device Kokoro voices through ONNX Runtime, with the same say/save_to_file/runAndWait
+surface as a pyttsx3 engine so MusicTutor can use either one
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from typing import List
+
+# Kokoro model files (download from the kokoro-onnx releases page)
+KOKORO_MODEL_PATH = os.getenv("KOKORO_MODEL", "kokoro-v1.0.onnx")
+KOKORO_VOICES_PATH = os.getenv("KOKORO_VOICES", "voices-v1.0.bin")
+DEFAULT_VOICE = "af_heart"
+
+# Sentence boundaries - each sentence is synthesized while the previous one plays
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?])\s+')
+
+
+def neural_tts_available() -> bool:
+    """Check the optional packages are installed without importing onnxruntime yet"""
+    return all(find_spec(name) is not None for name in ("kokoro_onnx", "sounddevice", "soundfile"))
+
+
+class _Voice:
+    """Minimal stand-in for a pyttsx3 voice entry"""
+
+    def __init__(self, voice_id: str):
+        self.id = voice_id
+        self.name = voice_id
+
+
+class NeuralTTS:
+    """
+    Kokoro ONNX speech engine exposing the pyttsx3 engine methods MusicTutor uses
+    """
+
+    def __init__(self, model_path: str = KOKORO_MODEL_PATH, voices_path: str = KOKORO_VOICES_PATH,
+                 voice: str = DEFAULT_VOICE, speed: float = 1.0):
+        """Load the ONNX model and voice pack once"""
+        from kokoro_onnx import Kokoro
+        import sounddevice
+        import soundfile
+
+        self._kokoro = Kokoro(model_path, voices_path)
+        self._sounddevice = sounddevice
+        self._soundfile = soundfile
+        self.voice = voice
+        self.speed = speed
+        self._queue = []
+        self._synthesizer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kokoro")
+
+    def getProperty(self, name: str):
+        """pyttsx3-style property access ('voices', 'voice', 'rate')"""
+        if name == 'voices':
+            return [_Voice(voice_id) for voice_id in self._kokoro.get_voices()]
+        if name == 'voice':
+            return self.voice
+        if name == 'rate':
+            return self.speed
+        raise KeyError(name)
+
+    def setProperty(self, name: str, value) -> None:
+        """pyttsx3-style property update ('voice' or 'rate' as a speed multiplier)"""
+        if name == 'voice':
+            self.voice = value
+        elif name == 'rate':
+            self.speed = value
+        else:
+            raise KeyError(name)
+
+    def say(self, text: str) -> None:
+        """Queue text to be spoken on the next runAndWait"""
+        self._queue.append((text, None))
+
+    def save_to_file(self, text: str, filename: str) -> None:
+        """Queue text to be rendered to a WAV file on the next runAndWait"""
+        self._queue.append((text, filename))
+
+    def _synthesize(self, text: str):
+        """Render one piece of text to (samples, sample_rate)"""
+        return self._kokoro.create(text, voice=self.voice, speed=self.speed, lang="en-us")
+
+    def _play(self, text: str) -> None:
+        """Play text sentence by sentence, rendering the next sentence while the current one plays"""
+        sentences: List[str] = [sentence for sentence in _SENTENCE_SPLIT_RE.split(text) if sentence.strip()]
+        if not sentences:
+            return
+
+        pending = self._synthesizer.submit(self._synthesize, sentences[0])
+        for next_sentence in sentences[1:] + [None]:
+            samples, sample_rate = pending.result()
+            if next_sentence is not None:
+                pending = self._synthesizer.submit(self._synthesize, next_sentence)
+            self._sounddevice.play(samples, sample_rate)
+            self._sounddevice.wait()
+
+    def runAndWait(self) -> None:
+        """Render and play (or save) everything queued, blocking until done"""
+        queue, self._queue = self._queue, []
+        for text, filename in queue:
+            if filename:
+                samples, sample_rate = self._synthesize(text)
+                self._soundfile.write(filename, samples, sample_rate)
+            else:
+                self._play(text)
@@ -12,33 +12,88 @@ Now powered by OpenAI GPT models with optional Text-to-Speech capabilities!
 
 import sys
 import argparse
+import asyncio
+import json
 import re
 import os
 import time
-from typing import Generator, Optional, List, Dict, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import AsyncGenerator, Generator, Optional, List, Dict, Any, Tuple
+
+from keyword_matcher import KeywordMatcher
+from neural_tts import KOKORO_MODEL_PATH, NeuralTTS, neural_tts_available
+from semantic_cache import SemanticCache
 
 # OpenAI imports
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import OpenAI, AsyncOpenAI, APIConnectionError, AuthenticationError
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     print("Error: OpenAI not available. Install with: pip install openai")
     sys.exit(1)
 
-# TTS imports (optional)
+# Fast JSON parsing for the knowledge files (optional, falls back to the json module)
 try:
-    import pyttsx3
-    TTS_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    TTS_AVAILABLE = False
-    print("Warning: TTS not available. Install with: pip install pyttsx3")
+    ORJSON_AVAILABLE = False
+
+# TTS imports (optional, deferred until text-to-speech is actually requested)
+@lru_cache(maxsize=None)
+def _load_tts_module():
+    """Import pyttsx3 on first use; returns None when it is not installed"""
+    try:
+        import pyttsx3
+        return pyttsx3
+    except ImportError:
+        print("Warning: TTS not available. Install with: pip install pyttsx3")
+        return None
+
+@lru_cache(maxsize=None)
+def _load_playback_module():
+    """Import simpleaudio on first use; returns None when it is not installed"""
+    try:
+        import simpleaudio
+        return simpleaudio
+    except ImportError:
+        return None
+
+def _play_wave_file(filename: str) -> bool:
+    """Play a rendered WAV file; False if simpleaudio is missing or can't read it"""
+    simpleaudio = _load_playback_module()
+    if simpleaudio is None:
+        return False
+    try:
+        simpleaudio.WaveObject.from_wave_file(filename).play().wait_done()
+        return True
+    except Exception:
+        return False
+
+def _create_tts_engine(backend: str = "auto"):
+    """Create the speech engine - Kokoro neural voices when set up, pyttsx3 otherwise (None if neither)"""
+    use_kokoro = backend == "kokoro" or (backend == "auto" and os.path.exists(KOKORO_MODEL_PATH))
+    if use_kokoro:
+        if neural_tts_available():
+            try:
+                return NeuralTTS()
+            except Exception as e:
+                print(f"Warning: neural TTS failed to load ({e}), falling back to pyttsx3")
+        else:
+            print("Warning: neural TTS not available. Install with: pip install kokoro-onnx sounddevice soundfile")
+    
+    pyttsx3 = _load_tts_module()
+    return pyttsx3.init() if pyttsx3 is not None else None
 
 # Import enhanced Slakh instrument data and music theory knowledge
 try:
     from slakh_instrument_data import (
         get_enhanced_music_keywords,
-        is_professional_music_term,
         get_instrument_class,
         get_instrument_info,
         SLAKH_INSTRUMENT_CLASSES,
@@ -50,6 +105,354 @@ except ImportError:
     SLAKH_AVAILABLE = False
     print("Warning: Slakh instrument data not available.")
 
+# Comprehensive music keywords for HorizonJam
+MUSIC_KEYWORDS = frozenset({
+    # Theory & Fundamentals
+    "music", "chord", "scale", "note", "interval", "key", "signature", "mode", "degree",
+    "major", "minor", "diminished", "augmented", "seventh", "ninth", "sus", "add",
+    "triad", "inversion", "progression", "cadence", "resolution", "voice leading",
+    "circle", "fifths", "fourth", "fifth", "third", "sixth", "second", "unison",
+    "perfect", "imperfect", "consonant", "dissonant", "tension", "release",
+    
+    # Advanced Music Theory
+    "chromatic", "diatonic", "enharmonic", "modal", "tonality", "atonal",
+    "counterpoint", "species counterpoint", "part writing", "tertian", "quartal", 
+    "quintal", "whole tone", "pentatonic", "hexatonic", "octatonic",
+    
+    # Cognitive/Music Perception
+    "ear training", "relative pitch", "perfect pitch", "sight singing", "audiation", 
+    "solfège", "movable do", "fixed do",
+    
+    # Compositional Concepts
+    "motivic development", "theme and variations", "through-composed", "binary form", 
+    "ternary form", "sonata", "rondo", "fugue", "countermelody", "ostinato", 
+    "pedal point", "sequence", "voice exchange",
+    
+    # Instruments
+    "guitar", "piano", "violin", "drums", "bass", "saxophone", "trumpet", 
+    "flute", "cello", "viola", "ukulele", "mandolin", "harp", "organ", "synthesizer",
+    "keyboard", "accordion", "harmonica", "banjo", "dobro", "fiddle", "double bass", "doublebass",
+    
+    # Musical Elements
+    "tempo", "rhythm", "beat", "meter", "time signature", "melody", "harmony",
+    "dynamics", "accent", "articulation", "phrase", "motif", "theme", "groove",
+    "swing", "shuffle", "syncopation", "polyrhythm", "cross rhythm",
+    "downbeat", "backbeat", "upbeat", "offbeat",
+    
+    # Technical Terms
+    "midi", "audio", "frequency", "pitch", "octave", "semitone", "tone", "cent",
+    "transpose", "modulation", "tuning", "intonation", "timbre", "waveform",
+    "fundamental", "overtone", "harmonic", "resonance", "envelope",
+    
+    # Electronic/Synthesis
+    "oscillator", "lfo", "filter", "adsr", "patch", "synth patch", "cv", "gate", 
+    "mod wheel", "sequencer", "step sequencer", "sampler", "sample rate", "bit depth", 
+    "aliasing", "vst", "virtual instrument",
+    
+    # Audio/Music Formats & Metadata
+    "mp3", "wav", "aiff", "flac", "midi file", "bpm", "metadata", "id3", "loop", 
+    "stem", "track name", "tempo map",
+    
+    # Notation & Theory
+    "staff", "clef", "measure", "bar", "rest", "sharp", "flat", "natural",
+    "accidental", "notation", "tablature", "lead sheet", "chord chart", "chart",
+    "fake book", "real book", "standard", "tune", "head",
+    
+    # Performance & Practice
+    "practice", "technique", "fingering", "picking", "strumming", "bowing",
+    "fingerpicking", "flatpicking",
+    "breath", "embouchure", "vibrato", "bend", "slide", "hammer", "pull",
+    "legato", "staccato", "pizzicato", "arco", "glissando", "trill",
+    
+    # Contemporary/Pop Songwriting
+    "topline", "co-write", "hook writing", "beat making", "loop-based",
+    "pre-chorus", "drop", "build", "climax", "melodic contour",
+    
+    # Styles & Genres
+    "jazz", "blues", "rock", "classical", "folk", "country", "metal", "funk",
+    "gospel", "latin", "reggae", "swing", "bebop", "fusion", "r&b", "soul",
+    "pop", "electronic", "ambient", "house", "techno", "dubstep", "hip hop",
+    
+    # Nashville Numbers & Analysis
+    "nashville", "numbers", "roman numeral", "analysis", "function",
+    "tonic", "supertonic", "mediant", "submediant", "subdominant", "dominant", "leading tone", "secondary dominant",
+    
+    # Audio Production
+    "recording", "mixing", "mastering", "eq", "equalizer", "reverb", "delay", 
+    "compression", "compressor", "limiter", "gate", "effect", "plugin", "daw",
+    "multitrack", "overdub", "punch", "bounce", "stems",
+    
+    # Song Structure
+    "verse", "chorus", "bridge", "intro", "outro", "solo", "riff", "lick",
+    "hook", "breakdown", "turnaround", "tag", "coda", "vamp", "jam",
+    
+    # Music Education
+    "lesson", "theory", "sight reading", "music school", "conservatory", 
+    "method", "etude", "exercise", "scale practice",
+    
+    # Music + AI / Music Tech
+    "music generation", "music ai", "openai music", "melody generation",
+    "chord recognition", "symbolic music", "note sequence", "midi generation", 
+    "audio transcription", "spectrogram",
+    
+    # Learning/Practice Intent (music-specific only)
+    "practice music", "how to play", "music lesson", "music practice",
+    "sound like", "hear music", "listen to music",
+    
+    # Performance Context
+    "gig", "session", "rehearsal", "soundcheck", "stage", "studio", "live",
+    "concert", "recital", "performance", "band", "ensemble", "orchestra",
+    "quartet", "trio", "duo", "solo", "accompaniment"
+})
+
+@lru_cache(maxsize=1)
+def _build_music_keywords() -> frozenset:
+    """Union of the HorizonJam keywords and the Slakh professional terms, built once"""
+    keywords = MUSIC_KEYWORDS
+    if SLAKH_AVAILABLE:
+        keywords = keywords | get_enhanced_music_keywords()
+    return frozenset(keyword.lower() for keyword in keywords)
+
+# Single-word keywords, checked against the prompt's tokens with one set operation
+_MUSIC_KEYWORD_WORDS = frozenset(keyword for keyword in _build_music_keywords() if " " not in keyword)
+_WORD_RE = re.compile(r"[\w&#°'-]+")
+
+# Every keyword (including multi-word phrases and Slakh terms) compiled into one single-pass matcher
+_MUSIC_KEYWORD_MATCHER = KeywordMatcher(_build_music_keywords())
+
+# Common music patterns, checked when no keyword matches
+MUSIC_PATTERNS = (
+    # Musical notation patterns
+    r'\b\d+/\d+\b',  # Time signatures (4/4, 3/4, etc.)
+    r'\bbpm\b',       # Beats per minute
+    r'\b[A-G][#b]?\s*scale\b',  # Scale references
+    r'\bkey\s+of\s+[A-G][#b]?\b',  # Key references
+    r'\b\d+th\b',     # Interval references (5th, 7th, etc.)
+    
+    # Intent-based patterns for music learning (case insensitive)
+    r'(how to|what is|explain|difference between|meaning of|example of).*\b(chord|scale|note|sound|song|music|play|instrument|theory|rhythm|melody|harmony|beat|tempo|key)\b',
+    r'(learn|practice|improve|study).*\b(music|guitar|piano|bass|drums|violin|singing|theory|chord|scale|instrument)\b',
+    r'(what does|what means?).*\b(chord|scale|note|key|tempo|rhythm|melody|harmony|progression|interval)\b',
+    r'\b(play|playing|learn|practice).*\b(guitar|piano|bass|drums|violin|saxophone|flute|ukulele|mandolin|music|instrument)\b',
+    r'\b(music|song|chord|scale|note|key|tempo|instrument)\b.*(question|help|explain|understand|learn|practice)',
+    
+    # Music technology patterns
+    r'\b(daw|vst|plugin|midi|audio)\b',
+    r'\b(recording|mixing|mastering|production)\b',
+    r'\b(synthesizer|synth|oscillator|filter|lfo|adsr)\b',
+    
+    # Advanced theory patterns
+    r'\b(counterpoint|voice leading|species|fugue|sonata|rondo)\b',
+    r'\b(chromatic|diatonic|modal|atonal|pentatonic|whole tone)\b',
+    r'\b(ear training|sight reading|solfège|perfect pitch|relative pitch)\b',
+)
+
+# All music patterns fused into one alternation, compiled once
+_MUSIC_PATTERN_RE = re.compile("|".join(f"(?:{pattern})" for pattern in MUSIC_PATTERNS), re.IGNORECASE)
+
+# Chord symbols (C major, F#m, Bb7, Gsus). A number, accidental or spelled-out quality makes a chord in any case
+# (g7, bb7, cdim); the bare "Am" form and spaced qualities need a capital root so "I am" or "a dim room" stay English
+# Extensions may be glued on (Csus4, Cadd9, C7sus4, F#m7b5); a leading number must be a chord degree, not "b12".
+# Each digit run is taken whole, so a long serial number or hash can't be split up in exponentially many ways
+_CHORD_QUALITY = r'(?:major|minor|maj|dim|aug|sus|add)'
+_CHORD_EXTENSION = r'(?:maj|min|dim|aug|sus|add|m|[#b]?\d+(?!\d))*'
+_CHORD_RE = re.compile(
+    r'(?<![\w#])(?:'
+    rf'(?i:(?:[a-g][#b]?(?:[245679]|1[13]|{_CHORD_QUALITY}|m\d)|[a-g][#b]m){_CHORD_EXTENSION})'
+    rf'|[A-G][#b]?\s+{_CHORD_QUALITY}{_CHORD_EXTENSION}'
+    rf'|[A-G][#b]?m{_CHORD_EXTENSION}(?!\s+I\b)'
+    # Two minor chords side by side read as chords even in lower case (am and em, dm - g#m)
+    r'|(?i:[a-g][#b]?m(?:\s*[-–,/]\s*|\s+(?:and|or|to)\s+)[a-g][#b]?m)'
+    r')(?![\w#])'
+)
+
+# Roman numeral progressions of two or more chords (I-IV-V, ii V I, V7 to I) - case-sensitive, upper is major
+# and lower is minor, and a lone "I" is the pronoun rather than a tonic
+_ROMAN_CHORD = r'(?:VII|VI|V|IV|III|II|I|vii|vi|v|iv|iii|ii|i)(?:maj7|°7?|7)?'
+_ROMAN_NUMERAL_RE = re.compile(rf'(?<!\w){_ROMAN_CHORD}(?:(?:\s*[-–]\s*|\s+(?:to\s+)?){_ROMAN_CHORD})+(?![\w°–-])')
+
+# Note and chord names as written (C, Bb, F#m7, "key of g") - the semantic cache only reuses answers about the same ones;
+# a lone lower-case "a" is the article unless a quality or accidental follows
+_NOTE_NAME_RE = re.compile(
+    r'(?<![\w#])(?:'
+    rf'[A-G][#b♯♭]?{_CHORD_EXTENSION}'
+    rf'|(?i:[a-g](?:[#b♯♭]|maj|min|dim|aug|sus|add|m|\d){_CHORD_EXTENSION})'
+    r'|[b-g]|a(?=\s+(?:major|minor|flat|sharp)\b)'
+    r')(?![\w#♯♭])'
+)
+
+# Nashville number progressions of three or more chords (1-4-5, 1-6m-4-5, 2m7-5-1)
+_NASHVILLE_CHORD = r'[1-7](?:maj7|m7|m|°|dim|sus[24]?|7)?'
+_NASHVILLE_RE = re.compile(
+    rf'(?<!\w){_NASHVILLE_CHORD}(?:\s*[-–]\s*{_NASHVILLE_CHORD}){{2,}}(?![\w°–-])'
+)
+
+@lru_cache(maxsize=1024)
+def _is_music_prompt(prompt: str) -> bool:
+    """Classify a prompt as music-related, cheapest checks first (memoized for repeated questions)"""
+    
+    # Lowercase once and share it with every check below
+    lowered = prompt.lower()
+    
+    # Fast path: whole-word keyword hits via one tokenization and a set lookup
+    if not _MUSIC_KEYWORD_WORDS.isdisjoint(_WORD_RE.findall(lowered)):
+        return True
+    
+    # Check for music keywords and Slakh professional terms (word-start matches such as "chords" or "guitarist")
+    if _MUSIC_KEYWORD_MATCHER.search(lowered, already_lower=True):
+        return True
+    
+    # Check for Nashville number progressions
+    if _NASHVILLE_RE.search(lowered):
+        return True
+    
+    # Check for chord symbols and Roman numeral analysis on the original text, where case matters
+    if _CHORD_RE.search(prompt) or _ROMAN_NUMERAL_RE.search(prompt):
+        return True
+    
+    # Check for common music patterns using regex
+    if _MUSIC_PATTERN_RE.search(lowered):
+        return True
+    
+    # If no music keywords or patterns found, it's not music-related
+    return False
+
+# HorizonJam system prompt - a fixed, byte-identical prefix for every request
+SYSTEM_PROMPT = """You are HorizonJam, a helpful music theory tutor and assistant.
+
+CRITICAL INSTRUCTIONS:
+- You ONLY answer music-related questions
+- If the input is not about music (e.g., programming, history, math, or general trivia), politely decline
+- Stick to music theory, practice tips, chords, intervals, scales, notation, audio processing, or instruments
+- Use musical terms, and provide examples when helpful
+- DO NOT entertain off-topic conversations, jokes, or general chitchat
+- Always begin your answers with a confident tone and musical relevance
+
+You are an expert music instructor with comprehensive knowledge across four key areas:
+
+**1. NASHVILLE NUMBERS SYSTEM:**
+- Convert chord progressions to/from Nashville numbers
+- Explain transposition using numbers (1-7)
+- Help with practical chord notation
+- Major scale relationships: 1(major), 2(minor), 3(minor), 4(major), 5(major), 6(minor), 7(diminished)
+
+**2. SLAKH DATASET KNOWLEDGE:**
+- Professional music production techniques
+- Instrument families and their characteristics
+- MIDI programming and synthesis
+- Audio production workflows
+- Genre-specific instrument usage
+
+**3. MUSIC THEORY FUNDAMENTALS:**
+- Scales, modes, and intervals
+- Chord construction and progressions
+- Key signatures and circle of fifths
+- Rhythm, meter, and time signatures
+- Harmonic analysis and voice leading
+
+**4. PROFESSIONAL PERFORMANCE:**
+- Performance techniques for all instruments
+- Ear training and sight-reading
+- Live performance preparation
+- Practice methodologies
+- Musical expression and interpretation
+
+**RESPONSE GUIDELINES:**
+- Always provide practical, actionable advice
+- Use examples relevant to the student's level
+- Include Nashville numbers when discussing chord progressions
+- Mention relevant instruments from professional contexts
+- Focus on building both theoretical understanding and practical skills
+- For chord progressions, always show both traditional notation and Nashville numbers
+- When discussing production, reference appropriate instrument classes and techniques
+
+**RESTRICTIONS:**
+- Only answer music-related questions
+- If asked non-music questions, politely redirect: "I'm here to help with music-related questions. What would you like to learn about music today?"
+- Keep responses educational and encouraging
+- Adapt complexity to the user's apparent level"""
+
+# One connection pool per client, reused across requests (keep-alive avoids a TCP+TLS handshake per call)
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Embedding model used to match near-duplicate questions in the semantic cache
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Whitespace after sentence-ending punctuation, where streamed text is handed to TTS
+_SENTENCE_BREAK_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Completion budgets - most answers fit well under the default; explicit requests for a short answer get less
+# ("briefly", "quick answer"), not questions that merely say "quick chord changes"
+DEFAULT_MAX_TOKENS = 800
+BRIEF_MAX_TOKENS = 300
+_BRIEF_REQUEST_RE = re.compile(
+    r"\b(briefly|in brief|(be|keep it) (brief|short)|(quick|short|brief) (answer|reply|summary|explanation)"
+    r"|in (one|a) (sentence|line|word)|one-liner|tl;?dr|yes or no)\b",
+    re.IGNORECASE
+)
+
+def suggest_max_tokens(prompt: str) -> int:
+    """Pick a max_tokens budget from the question - smaller when it asks for a short answer"""
+    return BRIEF_MAX_TOKENS if _BRIEF_REQUEST_RE.search(prompt) else DEFAULT_MAX_TOKENS
+
+def _semantic_cache_key(prompt: str, max_tokens: int) -> tuple:
+    """What a cached answer must share exactly besides meaning - note/chord names, progressions and token budget"""
+    return (
+        max_tokens,
+        tuple(name.lower() for name in _NOTE_NAME_RE.findall(prompt)),
+        # Progressions compared chord by chord, so "ii-V-I" and "ii V I" still share answers
+        tuple(tuple(re.findall(_ROMAN_CHORD, progression)) for progression in _ROMAN_NUMERAL_RE.findall(prompt)),
+        tuple(tuple(re.findall(_NASHVILLE_CHORD, progression)) for progression in _NASHVILLE_RE.findall(prompt.lower())),
+    )
+
+# Reply for prompts rejected by the music-only filter
+OFF_TOPIC_RESPONSE = "🎵 Hi! I'm HorizonJam, your music theory tutor. I only answer music-related questions about theory, chords, scales, instruments, and practice tips. Please ask me something about music!"
+
+def _describe_api_error(error: Exception) -> str:
+    """Explain an OpenAI API failure, saying what to fix for auth and network errors"""
+    if isinstance(error, AuthenticationError):
+        return "OpenAI rejected the API key. Check OPENAI_API_KEY or pass --api-key."
+    if isinstance(error, APIConnectionError):
+        return "could not reach the OpenAI API. Check your internet connection or proxy settings."
+    return str(error)
+
+class _StreamPrinter:
+    """
+    Writes streamed response text to stdout, flushing in small batches instead of once per token
+    """
+
+    def __init__(self, flush_bytes: int = 64, flush_interval: float = 0.05):
+        # Anything already printed through the text layer has to go out first
+        sys.stdout.flush()
+        self._binary = getattr(sys.stdout, "buffer", None)
+        self._encoding = sys.stdout.encoding or "utf-8"
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, text: str) -> None:
+        """Queue text; flush on a newline, every flush_bytes, or after flush_interval seconds"""
+        if self._binary is not None:
+            data = text.encode(self._encoding, errors="replace")
+            self._binary.write(data)
+            self._pending += len(data)
+        else:
+            # stdout swapped for a text-only stream (IDE consoles, captured output)
+            sys.stdout.write(text)
+            self._pending += len(text)
+        
+        now = time.monotonic()
+        if "\n" in text or self._pending >= self.flush_bytes or now - self._last_flush >= self.flush_interval:
+            self.flush(now)
+
+    def flush(self, now: Optional[float] = None) -> None:
+        """Push everything written so far to the terminal"""
+        (self._binary or sys.stdout).flush()
+        self._pending = 0
+        self._last_flush = time.monotonic() if now is None else now
+
 class MusicTutor:
     """
     OpenAI-powered Music Tutor with four-pillar knowledge integration
@@ -57,7 +460,8 @@ class MusicTutor:
 
     def __init__(self, api_key: Optional[str] = None, model: str = "gpt-4o",
                  enable_tts: bool = False, tts_device: Optional[str] = None,
-                 audio_output_dir: str = "audio_output"):
+                 audio_output_dir: str = "audio_output", enable_semantic_cache: bool = False,
+                 context_limit: int = 6, tts_backend: str = "auto"):
         """Initialize the Music Tutor with OpenAI API"""
         
         # Set up OpenAI API key
@@ -65,40 +469,62 @@ class MusicTutor:
         if not self.api_key:
             raise ValueError("OpenAI API key required. Set OPENAI_API_KEY environment variable or pass as argument.")
         
-        self.client = OpenAI(api_key=self.api_key)
+        self.client = OpenAI(
+            api_key=self.api_key,
+            http_client=httpx.Client(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        )
+        self._async_client = None
         self.model = model
+        self._system_message = {"role": "system", "content": self._create_system_prompt()}
+        
+        # Semantic cache setup (opt-in: costs one embeddings call per question)
+        self.semantic_cache = SemanticCache() if enable_semantic_cache else None
         
         # TTS setup
-        self.enable_tts = enable_tts and TTS_AVAILABLE
         self.tts_engine = None
         self.audio_output_dir = audio_output_dir
+        self._tts_executor = None
         
-        if self.enable_tts:
-            try:
-                self.tts_engine = pyttsx3.init()
-                if tts_device:
-                    voices = self.tts_engine.getProperty('voices')
-                    for voice in voices:
-                        if tts_device in voice.id:
-                            self.tts_engine.setProperty('voice', voice.id)
-                            break
-                
-                # Create audio output directory
-                os.makedirs(self.audio_output_dir, exist_ok=True)
-            except Exception as e:
-                print(f"Warning: TTS initialization failed: {e}")
-                self.enable_tts = False
+        if enable_tts:
+            # pyttsx3 drivers (SAPI5 via COM, macOS nsss) only work from the thread that created the engine,
+            # so the engine is built and configured on the single TTS thread that later speaks with it
+            self._tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
+            self.tts_engine = self._tts_executor.submit(self._init_tts_engine, tts_backend, tts_device).result()
+            if self.tts_engine is None:
+                self._tts_executor.shutdown(wait=False)
+                self._tts_executor = None
+        self.enable_tts = self.tts_engine is not None
 
-        self.conversation_history = []
+        # Bounded history: the oldest exchange drops off once context_limit exchanges are stored
+        # (a call asking for more context grows it - see _reserve_history)
+        self.conversation_history = deque(maxlen=max(context_limit, 0) * 2)
         
-        # Load knowledge systems
-        self.music_knowledge = self._load_enhanced_music_knowledge()
+        # Knowledge systems are loaded on first access (see music_knowledge)
+        self._music_knowledge = None
         
         print(f"✓ OpenAI Music Tutor initialized with model: {self.model}")
         if self.enable_tts:
             print("✓ Text-to-Speech enabled")
         if SLAKH_AVAILABLE:
             print("✓ Slakh dataset integration loaded")
+        if self.semantic_cache is not None:
+            print("✓ Semantic response cache enabled")
+
+    @property
+    def music_knowledge(self) -> Dict[str, Any]:
+        """Comprehensive music knowledge, read from disk the first time it is needed"""
+        if self._music_knowledge is None:
+            self._music_knowledge = self._load_enhanced_music_knowledge()
+        return self._music_knowledge
+
+    @staticmethod
+    def _read_json(path: str) -> Any:
+        """Parse a JSON file, using orjson when it is installed"""
+        if ORJSON_AVAILABLE:
+            with open(path, "rb") as f:
+                return orjson.loads(f.read())
+        with open(path, "r") as f:
+            return json.load(f)
 
     def _load_enhanced_music_knowledge(self) -> Dict[str, Any]:
         """Load comprehensive music knowledge from all sources"""
@@ -106,18 +532,13 @@ class MusicTutor:
         
         # Load Nashville Numbers data
         try:
-            import json
-            with open("four_pillar_training_data.json", "r") as f:
-                four_pillar_data = json.load(f)
-                knowledge["four_pillar"] = four_pillar_data
+            knowledge["four_pillar"] = self._read_json("four_pillar_training_data.json")
         except FileNotFoundError:
             print("Warning: Four-pillar training data not found")
         
         # Load music theory data
         try:
-            with open("music_theory_dataset.json", "r") as f:
-                theory_data = json.load(f)
-                knowledge["theory"] = theory_data
+            knowledge["theory"] = self._read_json("music_theory_dataset.json")
         except FileNotFoundError:
             print("Warning: Music theory dataset not found")
         
@@ -132,17 +553,8 @@ class MusicTutor:
         return knowledge
 
     def check_connection(self) -> bool:
-        """Test OpenAI API connection"""
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": "Test"}],
-                max_tokens=1
-            )
-            return True
-        except Exception as e:
-            print(f"OpenAI connection failed: {e}")
-            return False
+        """Test OpenAI API connection (one probe request against the configured model)"""
+        return self.check_model_exists(self.model)
 
     def check_model_exists(self, model_name: str) -> bool:
         """Check if the specified model exists and is accessible"""
@@ -153,320 +565,334 @@ class MusicTutor:
                 max_tokens=1
             )
             return True
+        except (AuthenticationError, APIConnectionError) as e:
+            print(f"OpenAI connection failed: {_describe_api_error(e)}")
+            return False
         except Exception as e:
             print(f"Model {model_name} not accessible: {e}")
             return False
 
     def _create_system_prompt(self) -> str:
         """Create HorizonJam system prompt - music-only assistant"""
-        base_prompt = """You are HorizonJam, a helpful music theory tutor and assistant.
+        return SYSTEM_PROMPT
 
-CRITICAL INSTRUCTIONS:
-- You ONLY answer music-related questions
-- If the input is not about music (e.g., programming, history, math, or general trivia), politely decline
-- Stick to music theory, practice tips, chords, intervals, scales, notation, audio processing, or instruments
-- Use musical terms, and provide examples when helpful
-- DO NOT entertain off-topic conversations, jokes, or general chitchat
-- Always begin your answers with a confident tone and musical relevance
+    @property
+    def async_client(self) -> "AsyncOpenAI":
+        """AsyncOpenAI client for concurrent requests, created on first use"""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+            )
+        return self._async_client
 
-You are an expert music instructor with comprehensive knowledge across four key areas:
+    def close(self) -> None:
+        """Release pooled connections and finish any queued speech (inside a running event loop, await aclose() too)"""
+        self.client.close()
+        if self._async_client is not None:
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # No loop running here, so the async pool can be shut down synchronously
+                try:
+                    asyncio.run(self.aclose())
+                except Exception:
+                    # Its connections were bound to a loop that has already closed
+                    self._async_client = None
+            else:
+                print("Warning: close() called inside an event loop; await aclose() to release async connections")
+        if self._tts_executor is not None:
+            self._tts_executor.shutdown(wait=True)
+            self._tts_executor = None
+            self.tts_engine = None
+            self.enable_tts = False
 
-**1. NASHVILLE NUMBERS SYSTEM:**
-- Convert chord progressions to/from Nashville numbers
-- Explain transposition using numbers (1-7)
-- Help with practical chord notation
-- Major scale relationships: 1(major), 2(minor), 3(minor), 4(major), 5(major), 6(minor), 7(diminished)
+    async def aclose(self) -> None:
+        """Release the async client's pooled connections"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
 
-**2. SLAKH DATASET KNOWLEDGE:**
-- Professional music production techniques
-- Instrument families and their characteristics
-- MIDI programming and synthesis
-- Audio production workflows
-- Genre-specific instrument usage
+    def _build_messages(self, prompt: str, context_limit: int) -> List[Dict[str, str]]:
+        """Build the chat messages: system prompt, recent history, then the new question"""
+        messages = [self._system_message]
+        
+        # Add recent conversation history (limited)
+        if context_limit > 0:
+            self._reserve_history(context_limit)
+            skip = max(len(self.conversation_history) - context_limit * 2, 0)
+            messages.extend(islice(self.conversation_history, skip, None))
+        
+        # Add current user message
+        messages.append({"role": "user", "content": prompt})
+        return messages
 
-**3. MUSIC THEORY FUNDAMENTALS:**
-- Scales, modes, and intervals
-- Chord construction and progressions
-- Key signatures and circle of fifths
-- Rhythm, meter, and time signatures
-- Harmonic analysis and voice leading
+    def _reserve_history(self, context_limit: int) -> None:
+        """Keep at least context_limit exchanges from now on when a call asks for more than the tutor was built with"""
+        kept = self.conversation_history.maxlen // 2
+        if context_limit > kept:
+            print(f"Warning: context_limit={context_limit} is above the {kept} exchanges kept so far; "
+                  f"older history is already gone, up to {context_limit} will be kept from now on")
+            self.conversation_history = deque(self.conversation_history, maxlen=context_limit * 2)
 
-**4. PROFESSIONAL PERFORMANCE:**
-- Performance techniques for all instruments
-- Ear training and sight-reading
-- Live performance preparation
-- Practice methodologies
-- Musical expression and interpretation
+    def _remember(self, prompt: str, response: str) -> None:
+        """Store a completed exchange in conversation history"""
+        self.conversation_history.append({"role": "user", "content": prompt})
+        self.conversation_history.append({"role": "assistant", "content": response})
 
-**RESPONSE GUIDELINES:**
-- Always provide practical, actionable advice
-- Use examples relevant to the student's level
-- Include Nashville numbers when discussing chord progressions
-- Mention relevant instruments from professional contexts
-- Focus on building both theoretical understanding and practical skills
-- For chord progressions, always show both traditional notation and Nashville numbers
-- When discussing production, reference appropriate instrument classes and techniques
+    def _uses_semantic_cache(self, context_limit: int) -> bool:
+        """Cached answers are only reused for standalone questions (no conversation context)"""
+        return self.semantic_cache is not None and not (context_limit > 0 and self.conversation_history)
 
-**RESTRICTIONS:**
-- Only answer music-related questions
-- If asked non-music questions, politely redirect: "I'm here to help with music-related questions. What would you like to learn about music today?"
-- Keep responses educational and encouraging
-- Adapt complexity to the user's apparent level"""
+    def _embed(self, prompt: str) -> Optional[List[float]]:
+        """Embed a prompt for the semantic cache; None if the embeddings call fails"""
+        try:
+            return self.client.embeddings.create(model=EMBEDDING_MODEL, input=prompt).data[0].embedding
+        except Exception as e:
+            print(f"Warning: semantic cache lookup skipped: {e}")
+            return None
 
-        return base_prompt
+    async def _aembed(self, prompt: str) -> Optional[List[float]]:
+        """Async counterpart of _embed"""
+        try:
+            response = await self.async_client.embeddings.create(model=EMBEDDING_MODEL, input=prompt)
+            return response.data[0].embedding
+        except Exception as e:
+            print(f"Warning: semantic cache lookup skipped: {e}")
+            return None
 
     def is_music_related(self, prompt: str) -> bool:
         """HorizonJam music content detection - comprehensive music-only filtering"""
-        
-        # Check against enhanced music keywords from Slakh dataset
-        if SLAKH_AVAILABLE:
-            enhanced_keywords = get_enhanced_music_keywords()
-            if any(keyword in prompt.lower() for keyword in enhanced_keywords):
-                return True
-            
-            # Check for professional music terms
-            if is_professional_music_term(prompt):
-                return True
-        
-        # Comprehensive music keywords for HorizonJam
-        MUSIC_KEYWORDS = [
-            # Theory & Fundamentals
-            "music", "chord", "scale", "note", "interval", "key", "signature", "mode", "degree",
-            "major", "minor", "diminished", "augmented", "seventh", "ninth", "sus", "add",
-            "triad", "inversion", "progression", "cadence", "resolution", "voice leading",
-            "circle", "fifths", "fourth", "fifth", "third", "sixth", "second", "unison",
-            "perfect", "imperfect", "consonant", "dissonant", "tension", "release",
-            
-            # Advanced Music Theory
-            "chromatic", "diatonic", "enharmonic", "modal", "tonality", "atonal",
-            "counterpoint", "species counterpoint", "part writing", "tertian", "quartal", 
-            "quintal", "whole tone", "pentatonic", "hexatonic", "octatonic",
-            
-            # Cognitive/Music Perception
-            "ear training", "relative pitch", "perfect pitch", "sight singing", "audiation", 
-            "solfège", "movable do", "fixed do",
-            
-            # Compositional Concepts
-            "motivic development", "theme and variations", "through-composed", "binary form", 
-            "ternary form", "sonata", "rondo", "fugue", "countermelody", "ostinato", 
-            "pedal point", "sequence", "voice exchange",
-            
-            # Instruments
-            "guitar", "piano", "violin", "drums", "bass", "saxophone", "trumpet", 
-            "flute", "cello", "viola", "ukulele", "mandolin", "harp", "organ", "synthesizer",
-            "keyboard", "accordion", "harmonica", "banjo", "dobro", "fiddle",
-            
-            # Musical Elements
-            "tempo", "rhythm", "beat", "meter", "time signature", "melody", "harmony",
-            "dynamics", "accent", "articulation", "phrase", "motif", "theme", "groove",
-            "swing", "shuffle", "syncopation", "polyrhythm", "cross rhythm",
-            
-            # Technical Terms
-            "midi", "audio", "frequency", "pitch", "octave", "semitone", "tone", "cent",
-            "transpose", "modulation", "tuning", "intonation", "timbre", "waveform",
-            "fundamental", "overtone", "harmonic", "resonance", "envelope",
-            
-            # Electronic/Synthesis
-            "oscillator", "lfo", "filter", "adsr", "patch", "synth patch", "cv", "gate", 
-            "mod wheel", "sequencer", "step sequencer", "sampler", "sample rate", "bit depth", 
-            "aliasing", "vst", "virtual instrument",
-            
-            # Audio/Music Formats & Metadata
-            "mp3", "wav", "aiff", "flac", "midi file", "bpm", "metadata", "id3", "loop", 
-            "stem", "track name", "tempo map",
-            
-            # Notation & Theory
-            "staff", "clef", "measure", "bar", "rest", "sharp", "flat", "natural",
-            "accidental", "notation", "tablature", "lead sheet", "chord chart", "chart",
-            "fake book", "real book", "standard", "tune", "head",
-            
-            # Performance & Practice
-            "practice", "technique", "fingering", "picking", "strumming", "bowing",
-            "breath", "embouchure", "vibrato", "bend", "slide", "hammer", "pull",
-            "legato", "staccato", "pizzicato", "arco", "glissando", "trill",
-            
-            # Contemporary/Pop Songwriting
-            "topline", "co-write", "hook writing", "beat making", "loop-based",
-            "pre-chorus", "drop", "build", "climax", "melodic contour",
-            
-            # Styles & Genres
-            "jazz", "blues", "rock", "classical", "folk", "country", "metal", "funk",
-            "gospel", "latin", "reggae", "swing", "bebop", "fusion", "r&b", "soul",
-            "pop", "electronic", "ambient", "house", "techno", "dubstep", "hip hop",
-            
-            # Nashville Numbers & Analysis
-            "nashville", "numbers", "roman numeral", "analysis", "function",
-            "tonic", "subdominant", "dominant", "leading tone", "secondary dominant",
-            
-            # Audio Production
-            "recording", "mixing", "mastering", "eq", "equalizer", "reverb", "delay", 
-            "compression", "compressor", "limiter", "gate", "effect", "plugin", "daw",
-            "multitrack", "overdub", "punch", "bounce", "stems",
-            
-            # Song Structure
-            "verse", "chorus", "bridge", "intro", "outro", "solo", "riff", "lick",
-            "hook", "breakdown", "turnaround", "tag", "coda", "vamp", "jam",
-            
-            # Music Education
-            "lesson", "theory", "sight reading", "music school", "conservatory", 
-            "method", "etude", "exercise", "scale practice",
-            
-            # Music + AI / Music Tech
-            "music generation", "music ai", "openai music", "melody generation",
-            "chord recognition", "symbolic music", "note sequence", "midi generation", 
-            "audio transcription", "spectrogram",
-            
-            # Learning/Practice Intent (music-specific only)
-            "practice music", "how to play", "music lesson", "music practice",
-            "sound like", "hear music", "listen to music",
-            
-            # Performance Context
-            "gig", "session", "rehearsal", "soundcheck", "stage", "studio", "live",
-            "concert", "recital", "performance", "band", "ensemble", "orchestra",
-            "quartet", "trio", "duo", "solo", "accompaniment"
-        ]
-        
-        lowered = prompt.lower()
-        
-        # Check for music keywords
-        if any(keyword in lowered for keyword in MUSIC_KEYWORDS):
-            return True
-            
-        # Check for common music patterns using regex
-        import re
-        music_patterns = [
-            # Musical notation patterns
-            r'\b[A-G][#b]?\s*(major|minor|m|maj|dim|aug|\d|sus|add)\b',  # Chord patterns
-            r'\b\d+/\d+\b',  # Time signatures (4/4, 3/4, etc.)
-            r'\bbpm\b',       # Beats per minute
-            r'\b[A-G][#b]?\s*scale\b',  # Scale references
-            r'\bkey\s+of\s+[A-G][#b]?\b',  # Key references
-            r'\b\d+-\d+[m]?-\d+-\d+\b',  # Nashville number patterns (1-6m-4-5)
-            r'\b[IVivx]+\b',  # Roman numeral analysis
-            r'\b\d+th\b',     # Interval references (5th, 7th, etc.)
-            
-            # Intent-based patterns for music learning (case insensitive)
-            r'(how to|what is|explain|difference between|meaning of|example of).*\b(chord|scale|note|sound|song|music|play|instrument|theory|rhythm|melody|harmony|beat|tempo|key)\b',
-            r'(learn|practice|improve|study).*\b(music|guitar|piano|bass|drums|violin|singing|theory|chord|scale|instrument)\b',
-            r'(what does|what means?).*\b(chord|scale|note|key|tempo|rhythm|melody|harmony|progression|interval)\b',
-            r'\b(play|playing|learn|practice).*\b(guitar|piano|bass|drums|violin|saxophone|flute|ukulele|mandolin|music|instrument)\b',
-            r'\b(music|song|chord|scale|note|key|tempo|instrument)\b.*(question|help|explain|understand|learn|practice)',
-            
-            # Music technology patterns
-            r'\b(daw|vst|plugin|midi|audio)\b',
-            r'\b(recording|mixing|mastering|production)\b',
-            r'\b(synthesizer|synth|oscillator|filter|lfo|adsr)\b',
-            
-            # Advanced theory patterns
-            r'\b(counterpoint|voice leading|species|fugue|sonata|rondo)\b',
-            r'\b(chromatic|diatonic|modal|atonal|pentatonic|whole tone)\b',
-            r'\b(ear training|sight reading|solfège|perfect pitch|relative pitch)\b',
-        ]
-        
-        for pattern in music_patterns:
-            if re.search(pattern, lowered, re.IGNORECASE):
-                return True
-        
-        # If no music keywords or patterns found, it's not music-related
-        return False
+        return _is_music_prompt(prompt)
+
+    def _prepare(self, prompt: str, max_tokens: Optional[int],
+                 embedding: Optional[List[float]]) -> Tuple[int, Optional[tuple], Optional[str]]:
+        """Shared set-up for both response paths: completion budget, semantic cache key and any cached answer"""
+        # Size the completion budget to the question unless the caller set one
+        if max_tokens is None:
+            max_tokens = suggest_max_tokens(prompt)
+
+        # Reuse the answer to an equivalent earlier question
+        if embedding is None:
+            return max_tokens, None, None
+        cache_key = _semantic_cache_key(prompt, max_tokens)
+        cached = self.semantic_cache.lookup(embedding, cache_key)
+        if cached is not None:
+            self._remember(prompt, cached)
+        return max_tokens, cache_key, cached
+
+    def _completion_args(self, prompt: str, context_limit: int, max_tokens: int,
+                         temperature: float) -> Dict[str, Any]:
+        """Chat completion arguments shared by the sync, async and batch paths"""
+        return {
+            "model": self.model,
+            "messages": self._build_messages(prompt, context_limit),
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+
+    @staticmethod
+    def _chunk_text(chunk) -> Optional[str]:
+        """Text carried by one streamed chunk, if any"""
+        # Some chunks (e.g. usage or content-filter updates) carry no choices
+        if not chunk.choices:
+            return None
+        return chunk.choices[0].delta.content
+
+    def _finish(self, prompt: str, full_response: str, embedding: Optional[List[float]],
+                cache_key: Optional[tuple]) -> None:
+        """Shared wrap-up for both response paths: store the exchange and cache the answer"""
+        self._remember(prompt, full_response)
+        if embedding is not None:
+            self.semantic_cache.add(embedding, full_response, cache_key)
 
     def generate_response(self, prompt: str, temperature: float = 0.7, 
-                         max_tokens: int = 800, stream: bool = True,
+                         max_tokens: Optional[int] = None, stream: bool = True,
                          context_limit: int = 6, allow_all_topics: bool = False) -> Generator[str, None, None]:
         """Generate streaming response using OpenAI API"""
         
         if not allow_all_topics and not self.is_music_related(prompt):
-            yield "🎵 Hi! I'm HorizonJam, your music theory tutor. I only answer music-related questions about theory, chords, scales, instruments, and practice tips. Please ask me something about music!"
+            yield OFF_TOPIC_RESPONSE
+            return
+
+        embedding = self._embed(prompt) if self._uses_semantic_cache(context_limit) else None
+        max_tokens, cache_key, cached = self._prepare(prompt, max_tokens, embedding)
+        if cached is not None:
+            yield cached
             return
 
         try:
-            # Build messages with conversation history
-            messages = [{"role": "system", "content": self._create_system_prompt()}]
-            
-            # Add recent conversation history (limited)
-            recent_history = self.conversation_history[-context_limit*2:] if context_limit > 0 else []
-            messages.extend(recent_history)
-            
-            # Add current user message
-            messages.append({"role": "user", "content": prompt})
+            request = self._completion_args(prompt, context_limit, max_tokens, temperature)
 
             # Make API call
             if stream:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                    stream=True
-                )
-                
                 full_response = ""
-                for chunk in response:
-                    if chunk.choices[0].delta.content:
-                        content = chunk.choices[0].delta.content
+                for chunk in self.client.chat.completions.create(**request, stream=True):
+                    content = self._chunk_text(chunk)
+                    if content:
                         full_response += content
                         yield content
-                
-                # Store in conversation history
-                self.conversation_history.append({"role": "user", "content": prompt})
-                self.conversation_history.append({"role": "assistant", "content": full_response})
-                
             else:
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature
-                )
-                
-                full_response = response.choices[0].message.content
+                full_response = self.client.chat.completions.create(**request).choices[0].message.content
                 yield full_response
-                
-                # Store in conversation history
-                self.conversation_history.append({"role": "user", "content": prompt})
-                self.conversation_history.append({"role": "assistant", "content": full_response})
+
+            self._finish(prompt, full_response, embedding, cache_key)
 
         except Exception as e:
-            yield f"Error generating response: {str(e)}"
+            yield f"Error generating response: {_describe_api_error(e)}"
 
     def chat_response(self, prompt: str, **kwargs) -> str:
         """Get complete response as string"""
         response_parts = list(self.generate_response(prompt, **kwargs))
         return "".join(response_parts)
 
-    def speak_response(self, text: str, save_to_file: bool = False) -> None:
-        """Convert text to speech using TTS"""
+    async def agenerate_response(self, prompt: str, temperature: float = 0.7,
+                                 max_tokens: Optional[int] = None, stream: bool = True,
+                                 context_limit: int = 6, allow_all_topics: bool = False) -> AsyncGenerator[str, None]:
+        """Generate streaming response with AsyncOpenAI (same behaviour as generate_response)"""
+        
+        if not allow_all_topics and not self.is_music_related(prompt):
+            yield OFF_TOPIC_RESPONSE
+            return
+
+        embedding = await self._aembed(prompt) if self._uses_semantic_cache(context_limit) else None
+        max_tokens, cache_key, cached = self._prepare(prompt, max_tokens, embedding)
+        if cached is not None:
+            yield cached
+            return
+
+        try:
+            request = self._completion_args(prompt, context_limit, max_tokens, temperature)
+
+            if stream:
+                full_response = ""
+                async for chunk in await self.async_client.chat.completions.create(**request, stream=True):
+                    content = self._chunk_text(chunk)
+                    if content:
+                        full_response += content
+                        yield content
+            else:
+                response = await self.async_client.chat.completions.create(**request)
+                full_response = response.choices[0].message.content
+                yield full_response
+
+            self._finish(prompt, full_response, embedding, cache_key)
+
+        except Exception as e:
+            yield f"Error generating response: {_describe_api_error(e)}"
+
+    async def abatch_response(self, prompts: List[str], max_concurrency: int = 8,
+                              temperature: float = 0.7, max_tokens: Optional[int] = None,
+                              allow_all_topics: bool = False) -> List[str]:
+        """Answer independent prompts concurrently, in input order, without touching conversation history"""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def answer(prompt: str) -> str:
+            if not allow_all_topics and not self.is_music_related(prompt):
+                return OFF_TOPIC_RESPONSE
+            async with semaphore:
+                try:
+                    response = await self.async_client.chat.completions.create(
+                        **self._completion_args(prompt, 0, max_tokens or suggest_max_tokens(prompt), temperature)
+                    )
+                    return response.choices[0].message.content
+                except Exception as e:
+                    return f"Error generating response: {_describe_api_error(e)}"
+
+        return list(await asyncio.gather(*(answer(prompt) for prompt in prompts)))
+
+    def batch_response(self, prompts: List[str], **kwargs) -> List[str]:
+        """Get complete responses for many prompts at once (blocking wrapper around abatch_response)"""
+        async def run() -> List[str]:
+            try:
+                return await self.abatch_response(prompts, **kwargs)
+            finally:
+                # asyncio.run closes its loop, so don't keep connections bound to it
+                await self.aclose()
+
+        return asyncio.run(run())
+
+    def _init_tts_engine(self, backend: str, device: Optional[str]):
+        """Create and configure the speech engine - runs on the TTS thread that will own it"""
+        try:
+            engine = _create_tts_engine(backend)
+            if engine is not None and device:
+                voices = engine.getProperty('voices')
+                for voice in voices:
+                    if device in voice.id:
+                        engine.setProperty('voice', voice.id)
+                        break
+            
+            # Create audio output directory
+            os.makedirs(self.audio_output_dir, exist_ok=True)
+            return engine
+        except Exception as e:
+            print(f"Warning: TTS initialization failed: {e}")
+            return None
+
+    def available_voices(self) -> list:
+        """Voices the speech engine offers, read on the TTS thread that owns it (empty without TTS)"""
+        if not self.tts_engine:
+            return []
+        return list(self._tts_executor.submit(self.tts_engine.getProperty, 'voices').result() or [])
+
+    def _run_tts(self, text: str, filename: Optional[str] = None, play: bool = True) -> None:
+        """Render (and optionally save) one utterance - runs on the TTS thread, one job at a time"""
+        # Drop speech still queued after 'tts off'
         if not self.enable_tts or not self.tts_engine:
             return
         
         try:
-            if save_to_file:
-                # Create unique filename
-                timestamp = int(time.time())
-                filename = os.path.join(self.audio_output_dir, f"response_{timestamp}.wav")
+            # Render once to the file and play that back, rather than synthesizing the text twice
+            if filename:
                 self.tts_engine.save_to_file(text, filename)
+                self.tts_engine.runAndWait()
                 print(f"Audio saved to: {filename}")
+                if not play or _play_wave_file(filename):
+                    return
             
-            # Speak the text
-            self.tts_engine.say(text)
-            self.tts_engine.runAndWait()
+            if play:
+                self.tts_engine.say(text)
+                self.tts_engine.runAndWait()
             
         except Exception as e:
             print(f"TTS error: {e}")
 
+    def speak_response(self, text: str, save_to_file: bool = False, play: bool = True,
+                       wait: bool = True) -> Optional[Future]:
+        """Convert text to speech using TTS (wait=False queues it and returns immediately)"""
+        if not self.enable_tts or not self.tts_engine:
+            return None
+        
+        filename = None
+        if save_to_file:
+            # Create unique filename
+            timestamp = int(time.time())
+            filename = os.path.join(self.audio_output_dir, f"response_{timestamp}.wav")
+        
+        # Every engine call goes through the TTS thread, so speech never blocks the chat loop
+        future = self._tts_executor.submit(self._run_tts, text, filename, play)
+        if wait:
+            future.result()
+        return future
+
     def interactive_mode(self, stream: bool = True, context_limit: int = 6,
                         allow_all_topics: bool = False, enable_tts_prompts: bool = False,
                         save_audio: bool = False):
         """Run interactive chat session"""
-        print("\n" + "="*60)
-        print("🎵 INTERACTIVE MUSIC TUTOR SESSION 🎵")
-        print("="*60)
-        print("Ask me about music theory, Nashville numbers, instruments, production, or performance!")
-        print("Type 'quit', 'exit', or 'bye' to end the session.")
-        print("Type 'clear' to clear conversation history.")
+        # Build the session banner and write it in one go
+        banner = [
+            "\n" + "="*60,
+            "🎵 INTERACTIVE MUSIC TUTOR SESSION 🎵",
+            "="*60,
+            "Ask me about music theory, Nashville numbers, instruments, production, or performance!",
+            "Type 'quit', 'exit', or 'bye' to end the session.",
+            "Type 'clear' to clear conversation history.",
+        ]
         if self.enable_tts:
-            print("Type 'tts on/off' to toggle text-to-speech.")
-        print("="*60 + "\n")
+            banner.append("Type 'tts on/off' to toggle text-to-speech.")
+        banner.append("="*60 + "\n")
+        sys.stdout.write("\n".join(banner) + "\n")
 
         while True:
             try:
@@ -481,13 +907,13 @@ You are an expert music instructor with comprehensive knowledge across four key
                     break
                 
                 if user_input.lower() == 'clear':
-                    self.conversation_history = []
+                    self.conversation_history.clear()
                     print("🧹 Conversation history cleared!")
                     continue
                 
                 if user_input.lower().startswith('tts '):
                     if user_input.lower() == 'tts on':
-                        self.enable_tts = True and TTS_AVAILABLE
+                        self.enable_tts = self.tts_engine is not None
                         print("🔊 TTS enabled" if self.enable_tts else "❌ TTS not available")
                     elif user_input.lower() == 'tts off':
                         self.enable_tts = False
@@ -496,21 +922,34 @@ You are an expert music instructor with comprehensive knowledge across four key
 
                 print("\n🤖 Tutor: ", end="", flush=True)
                 
+                # Speak each finished sentence while the rest of the answer streams in; when the answer is
+                # also saved, render it once to the file after streaming and play that back instead
+                speak_aloud = self.enable_tts and enable_tts_prompts
+                speak_live = speak_aloud and not save_audio
+                output = _StreamPrinter()
                 full_response = ""
+                pending_speech = ""
                 for chunk in self.generate_response(
                     user_input, 
                     stream=stream, 
                     context_limit=context_limit,
                     allow_all_topics=allow_all_topics
                 ):
-                    print(chunk, end="", flush=True)
+                    output.write(chunk)
                     full_response += chunk
+                    if speak_live:
+                        *sentences, pending_speech = _SENTENCE_BREAK_RE.split(pending_speech + chunk)
+                        for sentence in sentences:
+                            self.speak_response(sentence, wait=False)
                 
+                output.flush()
                 print("\n")
                 
-                # TTS output
-                if self.enable_tts and enable_tts_prompts:
-                    self.speak_response(full_response, save_to_file=save_audio)
+                # TTS output for the last sentence, or the whole answer rendered once to disk
+                if speak_live and pending_speech.strip():
+                    self.speak_response(pending_speech, wait=False)
+                elif speak_aloud and save_audio:
+                    self.speak_response(full_response, save_to_file=True, wait=False)
 
             except KeyboardInterrupt:
                 print("\n\n👋 Session interrupted. Thanks for learning music! 🎵")
@@ -530,6 +969,7 @@ Examples:
   python openai_music_tutor.py -p "What is the Nashville number system?"
   python openai_music_tutor.py -k "your-api-key" -p "Explain ii-V-I progression"
   python openai_music_tutor.py --enable-tts -p "How do I practice scales?"
+  python openai_music_tutor.py --batch-file questions.jsonl --batch-output answers.jsonl
         """
     )
     
@@ -539,28 +979,42 @@ Examples:
     parser.add_argument('--api-key', '-k', type=str, help='OpenAI API key (or set OPENAI_API_KEY env var)')
     parser.add_argument('--no-stream', action='store_true', help='Disable streaming responses')
     parser.add_argument('--interactive', '-i', action='store_true', help='Run in interactive mode')
+    parser.add_argument('--verify', action='store_true', help='Check the API key and model with a test request before starting')
+    
+    # Batch arguments
+    parser.add_argument('--batch-file', type=str, help='JSONL file of {"prompt": ...} lines to answer concurrently')
+    parser.add_argument('--batch-output', type=str, help='Write batch answers to this JSONL file instead of the console')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum simultaneous requests in batch mode')
     
     # Response parameters
     parser.add_argument('--temperature', '-t', type=float, default=0.7, help='Temperature (0.0-1.0)')
-    parser.add_argument('--max-tokens', type=int, default=800, help='Maximum tokens to generate')
+    parser.add_argument('--max-tokens', type=int,
+                        help=f'Maximum tokens to generate (default {DEFAULT_MAX_TOKENS}, or {BRIEF_MAX_TOKENS} when the question asks for a brief answer)')
     parser.add_argument('--concise', action='store_true', help='Force concise responses')
     parser.add_argument('--single-mode', action='store_true', help='Single question mode (no context)')
     parser.add_argument('--context-limit', type=int, default=6, help='Conversation history limit')
     parser.add_argument('--allow-all-topics', action='store_true', help='Allow non-music questions')
+    parser.add_argument('--semantic-cache', action='store_true',
+                        help='Reuse answers to near-duplicate questions (one extra embeddings call per question)')
     
     # TTS arguments
     parser.add_argument('--enable-tts', action='store_true', help='Enable text-to-speech')
     parser.add_argument('--save-audio', action='store_true', help='Save audio responses to files')
     parser.add_argument('--audio-output-dir', type=str, default='audio_output', help='Audio output directory')
     parser.add_argument('--tts-device', type=str, help='TTS voice ID or device name')
+    parser.add_argument('--tts-engine', choices=['auto', 'kokoro', 'pyttsx3'], default='auto',
+                        help='Speech engine: Kokoro neural voices (ONNX) or system pyttsx3 (auto uses Kokoro when its model is present)')
     
     args = parser.parse_args()
     
     # Adjust parameters for concise mode
     if args.concise:
-        args.max_tokens = min(args.max_tokens, 300)
+        args.max_tokens = min(args.max_tokens or DEFAULT_MAX_TOKENS, BRIEF_MAX_TOKENS)
         args.temperature = 0.3
 
+    context_limit = 0 if args.single_mode else args.context_limit
+
+    tutor = None
     try:
         # Initialize tutor
         tutor = MusicTutor(
@@ -568,22 +1022,52 @@ Examples:
             model=args.model,
             enable_tts=args.enable_tts,
             tts_device=args.tts_device,
-            audio_output_dir=args.audio_output_dir
+            audio_output_dir=args.audio_output_dir,
+            enable_semantic_cache=args.semantic_cache,
+            context_limit=context_limit,
+            tts_backend=args.tts_engine
         )
         
-        # Test connection
-        if not tutor.check_connection():
-            print("❌ Failed to connect to OpenAI API. Please check your API key and internet connection.")
-            return
+        # Optional connection test (costs an extra round-trip, so only on request)
+        if args.verify:
+            if not tutor.check_connection():
+                print("❌ Failed to connect to OpenAI API. Please check your API key and internet connection.")
+                return
+            print(f"✓ OpenAI API reachable and model {tutor.model} accessible")
         
-        context_limit = 0 if args.single_mode else args.context_limit
+        if args.batch_file:
+            # Batch mode - independent questions answered concurrently
+            with open(args.batch_file, "r", encoding="utf-8") as f:
+                prompts = [json.loads(line)["prompt"] for line in f if line.strip()]
+            
+            responses = tutor.batch_response(
+                prompts,
+                max_concurrency=args.concurrency,
+                temperature=args.temperature,
+                max_tokens=args.max_tokens,
+                allow_all_topics=args.allow_all_topics
+            )
+            
+            if args.batch_output:
+                with open(args.batch_output, "w", encoding="utf-8") as f:
+                    for prompt, response in zip(prompts, responses):
+                        f.write(json.dumps({"prompt": prompt, "response": response}, ensure_ascii=False) + "\n")
+                print(f"✓ Wrote {len(responses)} responses to {args.batch_output}")
+            else:
+                for prompt, response in zip(prompts, responses):
+                    print(f"\n🎵 Music Question: {prompt}")
+                    print("🤖 Tutor Response:")
+                    print("-" * 50)
+                    print(response)
+                    print("-" * 50)
         
-        if args.prompt:
+        elif args.prompt:
             # Single prompt mode
             print(f"\n🎵 Music Question: {args.prompt}")
             print("🤖 Tutor Response:")
             print("-" * 50)
             
+            output = _StreamPrinter()
             full_response = ""
             for chunk in tutor.generate_response(
                 args.prompt,
@@ -593,9 +1077,10 @@ Examples:
                 context_limit=context_limit,
                 allow_all_topics=args.allow_all_topics
             ):
-                print(chunk, end="", flush=True)
+                output.write(chunk)
                 full_response += chunk
             
+            output.flush()
             print("\n" + "-" * 50)
             
             # TTS for single prompt
@@ -628,6 +1113,9 @@ Examples:
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
+    finally:
+        if tutor is not None:
+            tutor.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
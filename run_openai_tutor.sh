@@ -14,9 +14,9 @@ echo "✅ Python found: $(python3 --version)"
 # Check for required packages
 echo "🔍 Checking OpenAI dependencies..."
 
-if ! python3 -c "import openai" 2>/dev/null; then
+if ! python3 -c "import openai, httpx" 2>/dev/null; then
     echo "❌ OpenAI package not found. Installing..."
-    pip install openai>=0.28.0
+    pip install "openai>=1.0" httpx
 fi
 
 # Check for optional TTS package
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Semantic Response Cache for HorizonJam
+Reuses an earlier answer when a new question means the same thing ("what is ii-V-I?" vs "explain the ii V I progression")
+Questions are compared by cosine similarity of their embeddings; pure Python, no numpy required
+An optional exact key (e.g. the note names asked about) must also match, since "C major" and "G major" embed almost alike
+"""
+
+import math
+import operator
+from collections import OrderedDict
+from typing import Hashable, Optional, Sequence, Tuple
+
+
+class SemanticCache:
+    """
+    Bounded LRU cache of question embeddings -> responses with cosine-similarity lookup
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 256):
+        """Create an empty cache; lookups hit when similarity is at least threshold"""
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Tuple[float, ...]:
+        """Scale to unit length so cosine similarity is a plain dot product"""
+        norm = math.sqrt(sum(value * value for value in embedding))
+        if not norm:
+            return tuple(embedding)
+        return tuple(value / norm for value in embedding)
+
+    def lookup(self, embedding: Sequence[float], key: Hashable = None) -> Optional[str]:
+        """Return the cached response for the most similar question with the same key, or None below threshold"""
+        query = self._normalize(embedding)
+        best_id, best_score = None, self.threshold
+        for entry_id, (vector, entry_key, _) in self._entries.items():
+            if entry_key != key:
+                continue
+            score = sum(map(operator.mul, query, vector))
+            if score >= best_score:
+                best_id, best_score = entry_id, score
+
+        if best_id is None:
+            return None
+        self._entries.move_to_end(best_id)
+        return self._entries[best_id][2]
+
+    def add(self, embedding: Sequence[float], response: str, key: Hashable = None) -> None:
+        """Cache a response under key, evicting the least recently used entry when full"""
+        self._entries[self._next_id] = (self._normalize(embedding), key, response)
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        self._entries.clear()
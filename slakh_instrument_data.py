@@ -5,6 +5,10 @@ Enhanced instrument knowledge derived from Slakh2100 dataset
 Contains 34 professional instrument classes and detailed MIDI mappings
 """
 
+from functools import lru_cache
+
+from keyword_matcher import KeywordMatcher
+
 # Slakh 34 Instrument Classes (professional categorization)
 SLAKH_INSTRUMENT_CLASSES = {
     # String Instruments
@@ -388,14 +392,30 @@ PROFESSIONAL_INSTRUMENT_TERMS = {
     ]
 }
 
+def _freeze(obj):
+    """Recursively turn lists into tuples so the static tables can't be mutated by callers"""
+    if isinstance(obj, dict):
+        return {key: _freeze(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(item) for item in obj)
+    return obj
+
+# Static tables are read-only after import; tuples are smaller than lists and safe to share
+SLAKH_INSTRUMENT_CLASSES = _freeze(SLAKH_INSTRUMENT_CLASSES)
+SYNTHESIS_KNOWLEDGE = _freeze(SYNTHESIS_KNOWLEDGE)
+PROFESSIONAL_INSTRUMENT_TERMS = {
+    category: frozenset(terms) for category, terms in PROFESSIONAL_INSTRUMENT_TERMS.items()
+}
+
+# Every professional term in one set (terms shared by categories, like 'embouchure', appear once)
+_FLAT_PROFESSIONAL_TERMS = frozenset(
+    term for terms in PROFESSIONAL_INSTRUMENT_TERMS.values() for term in terms
+)
+
 # Enhanced music keywords combining current system with Slakh professional terms
+@lru_cache(maxsize=1)
 def get_enhanced_music_keywords():
-    """Return comprehensive music keywords including Slakh-derived professional terms"""
-    
-    # Flatten all professional terms into a single set
-    professional_terms = set()
-    for category in PROFESSIONAL_INSTRUMENT_TERMS.values():
-        professional_terms.update(category)
+    """Return comprehensive music keywords including Slakh-derived professional terms (built once)"""
     
     # Instrument class names
     instrument_names = set(SLAKH_INSTRUMENT_CLASSES.keys())
@@ -413,12 +433,25 @@ def get_enhanced_music_keywords():
         'keyboard', 'synth', 'organ', 'ukulele', 'mandolin', 'banjo', 'harmonica',
     }
     
-    return current_keywords | professional_terms | {name.lower() for name in instrument_names}
+    return frozenset(current_keywords | _FLAT_PROFESSIONAL_TERMS | {name.lower() for name in instrument_names})
+
+# Shared, immutable keyword universe for callers that only need membership tests
+ENHANCED_MUSIC_KEYWORDS = get_enhanced_music_keywords()
+
+# Flat lookup table indexed directly by MIDI program number (0-128)
+_MIDI_CLASS_TABLE = tuple(
+    MIDI_TO_SLAKH_CLASS.get(program, 'Unknown') for program in range(max(MIDI_TO_SLAKH_CLASS) + 1)
+)
 
 # Function to get instrument class from MIDI program number
 def get_instrument_class(midi_program):
     """Get Slakh instrument class from MIDI program number"""
-    return MIDI_TO_SLAKH_CLASS.get(midi_program, 'Unknown')
+    try:
+        if midi_program >= 0:
+            return _MIDI_CLASS_TABLE[midi_program]
+    except (IndexError, TypeError):
+        pass
+    return 'Unknown'
 
 # Function to get detailed instrument information
 def get_instrument_info(class_name):
@@ -426,19 +459,11 @@ def get_instrument_info(class_name):
     return SLAKH_INSTRUMENT_CLASSES.get(class_name, {})
 
 # Function to check if term is related to professional music/instruments
-def is_professional_music_term(text):
+@lru_cache(maxsize=4096)
+def is_professional_music_term(text, already_lower=False):
     """Enhanced music term detection using Slakh-derived professional terminology"""
-    text_lower = text.lower()
-    enhanced_keywords = get_enhanced_music_keywords()
-    
-    # Check for any enhanced keywords
-    for keyword in enhanced_keywords:
-        if keyword in text_lower:
-            return True
-    
-    # Check instrument class names (case insensitive)
-    for class_name in SLAKH_INSTRUMENT_CLASSES.keys():
-        if class_name.lower() in text_lower:
-            return True
-    
-    return False 
\ No newline at end of file
+    # Instrument class names are already part of the enhanced keyword set
+    return _PROFESSIONAL_TERM_MATCHER.search(text, already_lower=already_lower) is not None
+
+# Single-pass matcher over every enhanced keyword, built once at import
+_PROFESSIONAL_TERM_MATCHER = KeywordMatcher(ENHANCED_MUSIC_KEYWORDS)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for HorizonJam prompt handling - KeywordMatcher backends, the music-only filter, answer budgets and the semantic cache
+"""
+
+import time
+
+import pytest
+
+import keyword_matcher
+from keyword_matcher import KeywordMatcher
+from semantic_cache import SemanticCache
+
+KEYWORDS = ["chord", "key", "add", "sus", "guitar", "bass", "c#", "a cappella"]
+
+PHRASES = [
+    "What chords fit this melody?",
+    "Is a monkey a good pet?",
+    "How do I play guitar?",
+    "harpsichord tuning",
+    "Songs in C# minor",
+    "Singing a cappella",
+    "bassist warmups",
+    "stone soup recipe",
+    "",
+]
+
+def _backend_matcher(backend, monkeypatch):
+    """Build a KeywordMatcher forced onto one backend, skipping when its package is missing"""
+    if backend == "hyperscan" and not keyword_matcher.HYPERSCAN_AVAILABLE:
+        pytest.skip("hyperscan not installed")
+    if backend == "ahocorasick" and not keyword_matcher.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick not installed")
+    monkeypatch.setattr(keyword_matcher, "HYPERSCAN_AVAILABLE", backend == "hyperscan")
+    monkeypatch.setattr(keyword_matcher, "AHOCORASICK_AVAILABLE", backend == "ahocorasick")
+    return KeywordMatcher(KEYWORDS)
+
+@pytest.mark.parametrize("backend", ["hyperscan", "ahocorasick", "regex"])
+@pytest.mark.parametrize("phrase", PHRASES)
+def test_backends_agree_with_regex(backend, phrase, monkeypatch):
+    """Every backend finds a keyword exactly when the regex fallback does"""
+    matcher = _backend_matcher(backend, monkeypatch)
+    reference = _backend_matcher("regex", monkeypatch)
+    assert (matcher.search(phrase) is None) == (reference.search(phrase) is None)
+
+@pytest.mark.parametrize("backend", ["hyperscan", "ahocorasick", "regex"])
+def test_keywords_anchor_to_word_start(backend, monkeypatch):
+    """Keywords may run on ("chords") but not sit inside another word ("harpsichord", "monkey")"""
+    matcher = _backend_matcher(backend, monkeypatch)
+    assert matcher.search("chords and keys") is not None
+    assert matcher.search("harpsichord") is None
+    assert matcher.search("monkey business") is None
+
+def test_empty_keyword_set():
+    assert KeywordMatcher([]).search("chord") is None
+
+# The prompt filter lives in the main module, which needs the OpenAI client installed
+@pytest.fixture(scope="module")
+def is_music_prompt():
+    pytest.importorskip("openai")
+    from openai_music_tutor import _is_music_prompt
+    return _is_music_prompt
+
+@pytest.mark.parametrize("prompt", [
+    "What is a chord?",
+    "Explain the ii-V-I progression",
+    "How do I play a 1-4-5 in G?",
+    "What key is F#m in?",
+    "Tips for guitar practice",
+    "g7 to c",
+    "a7 shape",
+    "how do i play bb7",
+    "difference between am and em",
+    "Am is the relative minor of C",
+    "What is Csus4?",
+    "Explain Cadd9",
+    "Gadd9",
+    "play Gsus2",
+    "C7sus4",
+    "F#m7b5 voicings",
+    "What is a downbeat?",
+    "explain the backbeat",
+    "upbeat songs",
+    "fingerpicking patterns",
+    "What is a supertonic?",
+    "doublebass",
+])
+def test_music_prompts_accepted(is_music_prompt, prompt):
+    assert is_music_prompt(prompt)
+
+@pytest.mark.parametrize("prompt", [
+    "I am hungry",
+    "Is a monkey a good pet?",
+    "How do I write code in Python?",
+    "How long should I bake a cake?",
+    "Skipping stones on a lake",
+    "Am I allowed to ask about taxes?",
+    "Is a dim room bad for reading?",
+    "How much vitamin b12 is too much?",
+])
+def test_off_topic_prompts_rejected(is_music_prompt, prompt):
+    assert not is_music_prompt(prompt)
+
+def test_long_digit_runs_classify_quickly(is_music_prompt):
+    """Serial numbers and hashes must not send the chord regex into exponential backtracking"""
+    start = time.perf_counter()
+    assert not is_music_prompt("Is serial C2" + "3" * 40 + "X valid?")
+    assert time.perf_counter() - start < 0.05
+
+@pytest.mark.parametrize("prompt, brief", [
+    ("Briefly, what is a tritone?", True),
+    ("Quick answer: how many sharps in D major?", True),
+    ("Explain modes in one sentence", True),
+    ("How do I make quick chord changes on guitar?", False),
+    ("What is a brief history of the blues scale?", False),
+])
+def test_max_tokens_follow_explicit_brevity(prompt, brief):
+    pytest.importorskip("openai")
+    from openai_music_tutor import BRIEF_MAX_TOKENS, DEFAULT_MAX_TOKENS, suggest_max_tokens
+    assert suggest_max_tokens(prompt) == (BRIEF_MAX_TOKENS if brief else DEFAULT_MAX_TOKENS)
+
+def test_semantic_cache_hits_similar_and_evicts_oldest():
+    cache = SemanticCache(threshold=0.9, max_entries=2)
+    cache.add([1.0, 0.0], "first")
+    cache.add([0.0, 1.0], "second")
+    assert cache.lookup([0.99, 0.05]) == "first"
+    assert cache.lookup([-1.0, 0.0]) is None
+
+    # "first" was just used, so adding a third entry evicts "second"
+    cache.add([0.7, 0.7], "third")
+    assert len(cache) == 2
+    assert cache.lookup([0.0, 1.0]) is None
+
+def test_semantic_cache_requires_matching_key():
+    cache = SemanticCache(threshold=0.9)
+    cache.add([1.0, 0.0], "C major answer", key=(800, ("c",)))
+    assert cache.lookup([1.0, 0.0], key=(800, ("g",))) is None
+    assert cache.lookup([1.0, 0.0], key=(300, ("c",))) is None
+    assert cache.lookup([1.0, 0.0], key=(800, ("c",))) == "C major answer"
+
+def test_semantic_cache_key_separates_roots_and_budgets():
+    pytest.importorskip("openai")
+    from openai_music_tutor import _semantic_cache_key
+    assert _semantic_cache_key("Notes in the C major scale?", 800) != _semantic_cache_key("Notes in the G major scale?", 800)
+    assert _semantic_cache_key("Notes in the C major scale?", 800) != _semantic_cache_key("Notes in the C major scale?", 300)
+    assert _semantic_cache_key("What is a ii-V-I?", 800) == _semantic_cache_key("Explain the ii V I progression", 800)
+
+def test_semantic_cache_key_handles_long_digit_runs():
+    pytest.importorskip("openai")
+    from openai_music_tutor import _semantic_cache_key
+    start = time.perf_counter()
+    _semantic_cache_key("Is serial C1" + "2" * 40 + "X valid?", 800)
+    assert time.perf_counter() - start < 0.05
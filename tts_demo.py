@@ -64,9 +64,8 @@ def demo_tts_music_tutor():
     print("After each response, you'll be prompted to play the audio.")
     
     for i, test in enumerate(test_questions, 1):
-        print(f"\n--- Question {i}: {test['description']} ---")
-        print(f"Q: {test['question']}")
-        print("A: ", end="", flush=True)
+        sys.stdout.write(f"\n--- Question {i}: {test['description']} ---\nQ: {test['question']}\nA: ")
+        sys.stdout.flush()
         
         # Generate response with TTS
         full_response = ""
@@ -89,38 +88,35 @@ def demo_voice_selection():
     print("\n🎭 Voice Selection Demo")
     print("-" * 30)
     
+    # Reuse the tutor's own engine rather than starting a second one just to list voices
+    runner = MusicTutor(
+        enable_tts=True,
+        audio_output_dir="voice_demo_output"
+    )
+    
+    if not runner.enable_tts:
+        print("❌ Failed to initialize TTS")
+        return
+    
     try:
-        import pyttsx3
-        engine = pyttsx3.init()
-        voices = engine.getProperty('voices')
+        voices = runner.available_voices()
         
         if voices:
-            print(f"📝 Found {len(voices)} system voices:")
-            for i, voice in enumerate(voices):
-                print(f"  {i+1}. {voice.name} ({voice.id})")
-            
-            print("\nTo use a specific voice:")
-            print("python openai_music_tutor.py --enable-tts --tts-device <voice_id>")
-            print("(Where <voice_id> is one of the IDs shown above)")
+            # Collect the voice listing and write it in one go
+            lines = [f"📝 Found {len(voices)} system voices:"]
+            lines.extend(f"  {i+1}. {voice.name} ({voice.id})" for i, voice in enumerate(voices))
+            lines.append("\nTo use a specific voice:")
+            lines.append("python openai_music_tutor.py --enable-tts --tts-device <voice_id>")
+            lines.append("(Where <voice_id> is one of the IDs shown above)")
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("❌ No system voices found")
-            
-        engine.stop()
         
     except Exception as e:
         print(f"❌ Failed to enumerate voices: {str(e)}")
     
-    # Test with different voice
-    runner = MusicTutor(
-        enable_tts=True,
-        audio_output_dir="voice_demo_output"
-    )
-    
-    if runner.enable_tts:
-        print("✅ TTS initialized with default voice!")
-        print("Ask a music question to hear the TTS response")
-    else:
-        print("❌ Failed to initialize TTS")
+    print("✅ TTS initialized with default voice!")
+    print("Ask a music question to hear the TTS response")
 
 def main():
     """Main demo function"""